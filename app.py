@@ -21,12 +21,13 @@ nltk.download('stopwords', quiet=True)
 # Suppress warnings if needed
 warnings.filterwarnings('ignore')
 from htmlTemplates import css, bot_template, user_template
+from textDedup import deduplicate_pages
 
 # Load environment variables from .env file
 load_dotenv()
 
 # File to store user credentials
-USER_DB_FILE = "user_database.json"
+USER_DB_FILE = os.getenv("BOOKBOT_USER_DB", "user_database.json")
 
 def img_to_base64(image):
     """Convert image to base64 for HTML display"""
@@ -347,16 +348,15 @@ def generate_gemini_response(model, prompt):
         return ""
 
 def extract_pdf_text(pdf_docs):
-    """Extract text from uploaded PDFs."""
-    text = ""
+    """Extract text from uploaded PDFs, removing repeated boilerplate and duplicate pages."""
+    documents = []
     for pdf in pdf_docs:
         try:
             pdf_reader = PdfReader(pdf)
-            for page in pdf_reader.pages:
-                text += page.extract_text() or ""
+            documents.append([page.extract_text() or "" for page in pdf_reader.pages])
         except Exception as e:
             st.error(f"Error reading PDF {pdf.name}: {str(e)}")
-    return text.strip()
+    return deduplicate_pages(documents)
 
 def process_user_input(user_question):
     """Handle user queries and display chat history."""
@@ -510,12 +510,18 @@ def main():
                     return
                     
                 with st.spinner("Processing..."):
-                    raw_text = extract_pdf_text(pdf_docs)
+                    raw_text, dedup_stats = extract_pdf_text(pdf_docs)
                     if not raw_text:
                         st.error("No text extracted from uploaded PDFs.")
                         return
                     st.session_state['pdf_text'] = raw_text
                     st.success("Documents processed successfully!")
+                    if dedup_stats["bytes_removed"] > 0:
+                        st.info(
+                            f"Removed {dedup_stats['pages_dropped']} duplicate pages and "
+                            f"{dedup_stats['lines_stripped']} header/footer lines "
+                            f"({dedup_stats['bytes_removed']:,} bytes, ~{dedup_stats['tokens_removed']:,} tokens)."
+                        )
         
         # Main chat area
         user_question = st.chat_input("Ask a question about your documents...")
@@ -0,0 +1,464 @@
+"""Concurrent-session load test for the Book Bot Insight Streamlit app.
+
+Runs app.py headlessly with Streamlit's AppTest and drives N user sessions at
+the same time through signup, login, upload, processing and several questions.
+A local stand-in replaces the Gemini model and nltk.download is stubbed out, so
+no API key or network is needed.
+
+AppTest is not thread-safe (each run installs and clears a process-global
+runtime), so every session runs in its own worker process. The numbers measure
+per-session rerun cost while N sessions compete for the machine's CPU, not
+thread contention inside a single `streamlit run` server process.
+
+Load-test users are written to temporary user databases via BOOKBOT_USER_DB,
+which are removed when the run finishes. Each worker gets its own database by
+default; pass --shared-user-db to have all workers share one file, which
+exercises the unlocked read-modify-write in save_user_database.
+
+Usage:
+    python loadTest.py --sessions 8 --concurrency 8 --rounds 3
+    python loadTest.py --save-baseline loadtest_baseline.json
+    python loadTest.py --compare loadtest_baseline.json
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import platform
+import tempfile
+import threading
+import multiprocessing
+from io import BytesIO
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(APP_DIR, "app.py")
+
+# Reruns can be slow under load, so allow much more than AppTest's 3s default
+RUN_TIMEOUT = 120
+
+PASSWORD = "LoadTest#2024"
+QUESTIONS = [
+    "What is this document about?",
+    "Summarize the second chapter.",
+    "List the key terms that are defined.",
+    "What conclusions does the author reach?",
+]
+
+# Latency percentiles compared against the baseline, with the number of samples
+# a step needs in both runs before that percentile is compared
+REGRESSION_METRICS = {"p50": 5, "p95": 20}
+
+# Peak resident memory of the current worker process, updated by _sample_rss
+_worker_peak_rss = [0.0]
+
+
+class FakeGeminiModel:
+    """Local stand-in for the Gemini model with a configurable delay"""
+
+    class _Response:
+        def __init__(self, text):
+            self.text = text
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def generate_content(self, prompt):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._Response(f"Stand-in answer based on {len(prompt)} prompt characters.")
+
+
+class _UploadedPdf(BytesIO):
+    """In-memory PDF that looks like a Streamlit UploadedFile"""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+
+def _fake_file_uploader(label, *args, **kwargs):
+    """Replacement for st.file_uploader, which AppTest cannot drive.
+
+    Returns the documents the journey placed in session state.
+    """
+    return st.session_state.get("_loadtest_uploads")
+
+
+def _pdf_escape(text):
+    """Escape text for a PDF string literal"""
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_sample_pdf(num_pages=6, title="Load Test Handbook"):
+    """Build a small text PDF with repeated headers/footers and a duplicate page"""
+    page_lines = []
+    for page_no in range(1, num_pages + 1):
+        chapter = page_no if page_no < num_pages else 1  # last page repeats chapter 1
+        lines = [f"{title} - Internal Use Only"]
+        lines += [
+            f"Chapter {chapter}: section {i} describes process {chapter * 10 + i} in detail."
+            for i in range(1, 25)
+        ]
+        lines.append(f"Page {page_no} of {num_pages}")
+        page_lines.append(lines)
+
+    font_id = 3
+    objects = {1: "<< /Type /Catalog /Pages 2 0 R >>",
+               font_id: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    page_ids = []
+    next_id = 4
+    for lines in page_lines:
+        body = "BT /F1 10 Tf 14 TL 50 780 Td " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in lines) + " ET"
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
+        objects[content_id] = f"<< /Length {len(body)} >>\nstream\n{body}\nendstream"
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                            f"/Resources << /Font << /F1 {font_id} 0 R >> >> "
+                            f"/Contents {content_id} 0 R >>")
+        page_ids.append(page_id)
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects[2] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>"
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = out.tell()
+        out.write(f"{obj_id} 0 obj\n{objects[obj_id]}\nendobj\n".encode("latin-1"))
+    xref_offset = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for obj_id in sorted(objects):
+        out.write(f"{offsets[obj_id]:010d} 00000 n \n".encode("latin-1"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+              f"startxref\n{xref_offset}\n%%EOF\n".encode("latin-1"))
+    return out.getvalue()
+
+
+def _init_worker(user_db_dir, shared_user_db, start_barrier):
+    """Set up a worker process: stub out network and upload calls, warm up, sample memory"""
+    import nltk
+
+    db_name = "user_database.json" if shared_user_db else f"user_database-{os.getpid()}.json"
+    os.environ["BOOKBOT_USER_DB"] = os.path.join(user_db_dir, db_name)
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+    nltk.download = lambda *args, **kwargs: True
+    st.file_uploader = _fake_file_uploader
+
+    # Untimed first run so one-off module imports aren't counted against a session,
+    # as in a long-running server
+    AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT).run()
+
+    _worker_peak_rss[0] = _current_rss_mb()
+    threading.Thread(target=_sample_rss, args=(_worker_peak_rss,), daemon=True).start()
+
+    # Don't start any journey until every worker has finished starting up
+    start_barrier.wait(timeout=RUN_TIMEOUT)
+
+
+def _timed_run(at, step, timings, check_errors=False):
+    """Run one script rerun and record its latency under the given step"""
+    start = time.perf_counter()
+    at.run(timeout=RUN_TIMEOUT)
+    timings.append((step, time.perf_counter() - start))
+    if at.exception:
+        raise RuntimeError(f"{step}: {at.exception[0].message}")
+    if check_errors and at.error:
+        raise RuntimeError(f"{step}: {at.error[0].value}")
+
+
+def run_user_journey(session_no, pdf_bytes, num_questions, model_latency):
+    """Drive one user session through signup, login, upload, processing and questions"""
+    timings = []
+    error = None
+    email = f"loadtest{session_no}-{uuid.uuid4().hex[:8]}@example.com"
+    started_at = time.time()
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT)
+        at.session_state["gemini_model"] = FakeGeminiModel(model_latency)
+        _timed_run(at, "initial_load", timings)
+
+        at.text_input(key="signup_username").input(f"loadtest{session_no}")
+        at.text_input(key="signup_email").input(email)
+        at.text_input(key="signup_password").input(PASSWORD)
+        at.text_input(key="confirm_password").input(PASSWORD)
+        at.button(key="signup_button").click()
+        _timed_run(at, "signup", timings, check_errors=True)
+
+        at.text_input(key="login_email").input(email)
+        at.text_input(key="login_password").input(PASSWORD)
+        at.button(key="login_button").click()
+        _timed_run(at, "login", timings, check_errors=True)
+        if not at.session_state["authenticated"]:
+            raise RuntimeError("login: session was not authenticated")
+
+        at.session_state["_loadtest_uploads"] = [
+            _UploadedPdf(pdf_bytes, "handbook.pdf"),
+            _UploadedPdf(pdf_bytes, "handbook_v2.pdf"),
+        ]
+        _timed_run(at, "upload", timings)
+
+        at.button(key="process_button").click()
+        _timed_run(at, "process", timings, check_errors=True)
+        if not at.session_state["pdf_text"]:
+            raise RuntimeError("process: no text was extracted")
+
+        for i in range(num_questions):
+            answered = len(at.session_state["chat_history"])
+            at.chat_input[0].set_value(QUESTIONS[i % len(QUESTIONS)])
+            _timed_run(at, "question", timings, check_errors=True)
+            if len(at.session_state["chat_history"]) <= answered:
+                raise RuntimeError("question: no answer was added to the chat history")
+    except Exception as e:
+        error = f"session {session_no}: {e}"
+
+    return {
+        "timings": timings,
+        "error": error,
+        "started_at": started_at,
+        "finished_at": time.time(),
+        "pid": os.getpid(),
+        "peak_rss": max(_worker_peak_rss[0], _current_rss_mb()),
+    }
+
+
+def percentile(values, pct):
+    """Return the pct-th percentile of values using linear interpolation"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize_latencies(latencies):
+    """Summarize a list of latencies in milliseconds"""
+    return {
+        "count": len(latencies),
+        "mean": round(1000 * sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        **{f"p{p}": round(1000 * percentile(latencies, p), 2) for p in (50, 90, 95, 99)},
+        "max": round(1000 * max(latencies), 2) if latencies else 0.0,
+    }
+
+
+def _sample_rss(peak, interval=0.05):
+    """Track peak resident memory of this process in the background"""
+    while True:
+        peak[0] = max(peak[0], _current_rss_mb())
+        time.sleep(interval)
+
+
+def _current_rss_mb():
+    """Return current resident memory in MB, falling back to the process peak"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def run_load_test(sessions, concurrency, num_questions, model_latency, rounds=1,
+                  shared_user_db=False):
+    """Run the user journeys in concurrent worker processes and return a results dict.
+
+    The set of sessions is run rounds times on the same workers, so there are
+    enough samples per step for stable percentiles.
+    """
+    # AppTest replaces sys.modules["__main__"] with the app inside the workers,
+    # so submit the harness functions under their importable module name
+    import loadTest as harness
+
+    pdf_bytes = build_sample_pdf()
+    journeys = sessions * rounds
+    # All journeys are submitted at once, so the pool starts exactly this many workers
+    workers = min(concurrency, journeys)
+    mp_context = multiprocessing.get_context("spawn")
+
+    # Keep the load-test users out of the real user database
+    with tempfile.TemporaryDirectory(prefix="bookbot-loadtest-") as work_dir, \
+            mp_context.Manager() as manager:
+        start_barrier = manager.Barrier(workers)
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=mp_context,
+                                 initializer=harness._init_worker,
+                                 initargs=(work_dir, shared_user_db, start_barrier)) as pool:
+            futures = [
+                pool.submit(harness.run_user_journey, i, pdf_bytes, num_questions, model_latency)
+                for i in range(journeys)
+            ]
+            results = [f.result() for f in futures]
+
+    # Time from the first journey starting to the last one finishing, so
+    # worker process startup is not counted
+    wall_time = max(r["finished_at"] for r in results) - min(r["started_at"] for r in results)
+    all_timings = [t for r in results for t in r["timings"]]
+    errors = [r["error"] for r in results if r["error"]]
+    steps = {}
+    for step, latency in all_timings:
+        steps.setdefault(step, []).append(latency)
+    worker_peaks = {}
+    for r in results:
+        worker_peaks[r["pid"]] = max(worker_peaks.get(r["pid"], 0.0), r["peak_rss"])
+
+    return {
+        "created_at": datetime.now().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "streamlit": st.__version__,
+            "platform": platform.platform(),
+        },
+        "config": {
+            "sessions": sessions,
+            "concurrency": concurrency,
+            "questions": num_questions,
+            "model_latency": model_latency,
+            "rounds": rounds,
+            "shared_user_db": shared_user_db,
+        },
+        "wall_time_s": round(wall_time, 3),
+        "throughput": {
+            "reruns_per_s": round(len(all_timings) / wall_time, 2) if wall_time else 0.0,
+            "journeys_per_s": round((journeys - len(errors)) / wall_time, 3) if wall_time else 0.0,
+        },
+        "latency_ms": {
+            "overall": summarize_latencies([latency for _, latency in all_timings]),
+            "steps": {step: summarize_latencies(values) for step, values in steps.items()},
+        },
+        "memory_mb": {
+            "peak_rss_per_worker": round(max(worker_peaks.values()), 1),
+            "peak_rss_total": round(sum(worker_peaks.values()), 1),
+        },
+        "errors": errors,
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Return a list of regressions of results against baseline.
+
+    Percentiles are only compared when both runs have enough samples for that
+    step, and metrics that are zero in the baseline are skipped.
+    """
+    if baseline["config"] != results["config"]:
+        return [f"config differs from the baseline: {baseline['config']} vs {results['config']}"]
+
+    regressions = []
+    base_steps = baseline["latency_ms"]["steps"]
+    for step, summary in results["latency_ms"]["steps"].items():
+        if step not in base_steps:
+            continue
+        for metric, min_samples in REGRESSION_METRICS.items():
+            if min(base_steps[step]["count"], summary["count"]) < min_samples:
+                continue
+            old, new = base_steps[step][metric], summary[metric]
+            if old and new > old * (1 + tolerance):
+                regressions.append(f"{step} {metric}: {old:.1f}ms -> {new:.1f}ms "
+                                   f"(+{100 * (new / old - 1):.0f}%)")
+
+    old_rate = baseline["throughput"]["reruns_per_s"]
+    new_rate = results["throughput"]["reruns_per_s"]
+    if old_rate and new_rate < old_rate * (1 - tolerance):
+        regressions.append(f"throughput: {old_rate:.2f} -> {new_rate:.2f} reruns/s")
+
+    old_rss = baseline["memory_mb"]["peak_rss_per_worker"]
+    new_rss = results["memory_mb"]["peak_rss_per_worker"]
+    if old_rss and new_rss > old_rss * (1 + tolerance):
+        regressions.append(f"peak RSS per worker: {old_rss:.1f}MB -> {new_rss:.1f}MB")
+    return regressions
+
+
+def print_report(results):
+    """Print a readable summary of the load test results"""
+    config = results["config"]
+    print(f"\nSessions: {config['sessions']} x {config['rounds']} rounds  Concurrency: {config['concurrency']}  "
+          f"Questions: {config['questions']}  Model latency: {config['model_latency']}s")
+    print(f"Wall time: {results['wall_time_s']}s  "
+          f"Throughput: {results['throughput']['reruns_per_s']} reruns/s, "
+          f"{results['throughput']['journeys_per_s']} journeys/s")
+    print(f"Peak RSS per worker: {results['memory_mb']['peak_rss_per_worker']}MB  "
+          f"Total across workers: {results['memory_mb']['peak_rss_total']}MB\n")
+
+    header = f"{'step':<14}{'count':>7}{'mean':>10}{'p50':>10}{'p90':>10}{'p95':>10}{'p99':>10}{'max':>10}"
+    print(header)
+    print("-" * len(header))
+    rows = list(results["latency_ms"]["steps"].items())
+    rows.append(("overall", results["latency_ms"]["overall"]))
+    for step, s in rows:
+        print(f"{step:<14}{s['count']:>7}{s['mean']:>10.1f}{s['p50']:>10.1f}{s['p90']:>10.1f}"
+              f"{s['p95']:>10.1f}{s['p99']:>10.1f}{s['max']:>10.1f}")
+
+    if results["errors"]:
+        print(f"\n{len(results['errors'])} session(s) failed:")
+        for error in results["errors"]:
+            print(f"  {error}")
+
+
+def main():
+    """Parse arguments, run the load test and handle the baseline"""
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for Book Bot Insight")
+    parser.add_argument("--sessions", type=int, default=8, help="Total number of user sessions")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Sessions running at the same time (default: all of them)")
+    parser.add_argument("--questions", type=int, default=3, help="Questions asked per session")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="Times to repeat the set of sessions (default: 3)")
+    parser.add_argument("--model-latency", type=float, default=0.2,
+                        help="Seconds the stand-in model waits per answer")
+    parser.add_argument("--shared-user-db", action="store_true",
+                        help="Have all workers share one user database file")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write results as a new baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare results against a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative regression before failing (default: 0.2)")
+    parser.add_argument("--output", metavar="PATH", help="Write the full results as JSON")
+    args = parser.parse_args()
+
+    results = run_load_test(args.sessions, args.concurrency or args.sessions,
+                            args.questions, args.model_latency, args.rounds, args.shared_user_db)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+        print(f"\nResults written to {args.output}")
+
+    exit_code = 1 if results["errors"] else 0
+    if args.save_baseline:
+        if results["errors"]:
+            print(f"\nNot saving baseline to {args.save_baseline}: some sessions failed.")
+        else:
+            with open(args.save_baseline, 'w') as f:
+                json.dump(results, f, indent=4)
+            print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        print(f"\nCompared against baseline from {baseline['created_at']}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        if regressions:
+            exit_code = 1
+        else:
+            print("  No regressions.")
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+import copy
+
+import pytest
+
+from loadTest import compare_to_baseline, percentile, summarize_latencies
+
+CONFIG = {
+    "sessions": 8,
+    "concurrency": 8,
+    "questions": 3,
+    "model_latency": 0.2,
+    "rounds": 3,
+    "shared_user_db": False,
+}
+
+
+def make_results(latency_ms=100.0, count=24, reruns_per_s=10.0, peak_rss=150.0):
+    step = {"count": count, "mean": latency_ms, "p50": latency_ms, "p90": latency_ms,
+            "p95": latency_ms, "p99": latency_ms, "max": latency_ms}
+    return {
+        "created_at": "2026-01-01T00:00:00",
+        "config": dict(CONFIG),
+        "throughput": {"reruns_per_s": reruns_per_s, "journeys_per_s": 1.0},
+        "latency_ms": {"overall": dict(step), "steps": {"question": dict(step)}},
+        "memory_mb": {"peak_rss_per_worker": peak_rss, "peak_rss_total": peak_rss * 8},
+        "errors": [],
+    }
+
+
+def test_percentile_interpolates():
+    values = [0.4, 0.1, 0.3, 0.2]
+    assert percentile(values, 0) == pytest.approx(0.1)
+    assert percentile(values, 50) == pytest.approx(0.25)
+    assert percentile(values, 95) == pytest.approx(0.385)
+    assert percentile(values, 100) == pytest.approx(0.4)
+
+
+def test_percentile_edge_cases():
+    assert percentile([], 95) == 0.0
+    assert percentile([0.5], 95) == 0.5
+
+
+def test_summarize_latencies_in_milliseconds():
+    summary = summarize_latencies([0.1, 0.2, 0.3, 0.4])
+    assert summary == {"count": 4, "mean": 250.0, "p50": 250.0, "p90": 370.0,
+                       "p95": 385.0, "p99": 397.0, "max": 400.0}
+
+
+def test_summarize_latencies_empty():
+    summary = summarize_latencies([])
+    assert summary["count"] == 0
+    assert summary["mean"] == summary["p95"] == summary["max"] == 0.0
+
+
+def test_identical_results_have_no_regressions():
+    assert compare_to_baseline(make_results(), make_results(), 0.2) == []
+
+
+def test_config_mismatch_fails_without_comparing():
+    results = make_results(latency_ms=1000.0)
+    results["config"]["sessions"] = 4
+    regressions = compare_to_baseline(results, make_results(), 0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("config differs")
+
+
+def test_latency_within_tolerance_passes():
+    assert compare_to_baseline(make_results(latency_ms=119.0), make_results(), 0.2) == []
+
+
+def test_latency_beyond_tolerance_fails():
+    regressions = compare_to_baseline(make_results(latency_ms=121.0), make_results(), 0.2)
+    assert regressions == [
+        "question p50: 100.0ms -> 121.0ms (+21%)",
+        "question p95: 100.0ms -> 121.0ms (+21%)",
+    ]
+
+
+def test_p95_skipped_below_min_samples():
+    regressions = compare_to_baseline(make_results(latency_ms=200.0, count=10),
+                                      make_results(count=10), 0.2)
+    assert regressions == ["question p50: 100.0ms -> 200.0ms (+100%)"]
+
+
+def test_percentiles_skipped_with_too_few_samples():
+    assert compare_to_baseline(make_results(latency_ms=200.0, count=4),
+                               make_results(), 0.2) == []
+
+
+def test_zero_in_baseline_is_skipped():
+    baseline = make_results(latency_ms=0.0, reruns_per_s=0.0, peak_rss=0.0)
+    results = make_results(latency_ms=500.0, reruns_per_s=1.0, peak_rss=500.0)
+    assert compare_to_baseline(results, baseline, 0.2) == []
+
+
+def test_step_missing_from_baseline_is_skipped():
+    baseline = make_results()
+    results = make_results()
+    results["latency_ms"]["steps"]["new_step"] = copy.deepcopy(
+        results["latency_ms"]["steps"]["question"])
+    results["latency_ms"]["steps"]["new_step"]["p50"] = 10000.0
+    assert compare_to_baseline(results, baseline, 0.2) == []
+
+
+def test_throughput_and_memory_regressions():
+    regressions = compare_to_baseline(make_results(reruns_per_s=7.0, peak_rss=200.0),
+                                      make_results(), 0.2)
+    assert regressions == [
+        "throughput: 10.00 -> 7.00 reruns/s",
+        "peak RSS per worker: 150.0MB -> 200.0MB",
+    ]
@@ -0,0 +1,90 @@
+import random
+
+from textDedup import (
+    deduplicate_pages,
+    drop_duplicate_pages,
+    strip_boilerplate_lines,
+)
+
+WORDS = ("alpha beta gamma delta epsilon zeta eta theta iota kappa lambda mu "
+         "nu xi omicron pi rho sigma tau upsilon phi chi psi omega").split()
+
+
+def make_body(seed, lines=15):
+    rng = random.Random(seed)
+    return "\n".join(" ".join(rng.choice(WORDS) for _ in range(10)) for _ in range(lines))
+
+
+def test_exact_duplicate_page_dropped():
+    pages = [make_body(1), make_body(2), make_body(1)]
+    kept, dropped = drop_duplicate_pages(pages)
+    assert dropped == 1
+    assert kept == pages[:2]
+
+
+def test_distinct_pages_kept():
+    pages = [make_body(seed) for seed in range(10)]
+    kept, dropped = drop_duplicate_pages(pages)
+    assert dropped == 0
+    assert kept == pages
+
+
+def test_header_and_footer_stripped():
+    pages = [f"ACME Corp Confidential\n{make_body(i)}\nPage {i + 1} of 6" for i in range(6)]
+    cleaned, stripped = strip_boilerplate_lines(pages)
+    assert stripped == 12
+    assert all("ACME" not in page and "Page" not in page for page in cleaned)
+    assert cleaned[0] == make_body(0)
+
+
+def test_numbered_body_lines_survive():
+    pages = []
+    for i in range(6):
+        steps = "\n".join(f"Step {i * 5 + j}: tighten the bolt." for j in range(3))
+        pages.append(f"ACME Corp Confidential\n{steps}\n{make_body(i)}\n{steps}\n- {i + 1} -")
+    cleaned, stripped = strip_boilerplate_lines(pages)
+    assert stripped == 12
+    for i, page in enumerate(cleaned):
+        assert page.count("tighten the bolt") == 6
+        assert f"Step {i * 5}:" in page
+
+
+def test_header_only_matches_top_of_page():
+    pages = [f"Summary\n{make_body(i)}" for i in range(2)]
+    pages += [f"{make_body(i)}\nSummary" for i in range(2, 4)]
+    pages += [make_body(i) for i in range(4, 6)]
+    cleaned, stripped = strip_boilerplate_lines(pages)
+    assert stripped == 0
+    assert cleaned == pages
+
+
+def test_boilerplate_detected_per_document():
+    small = [f"Small Report Header\n{make_body(i)}" for i in range(4)]
+    large = [make_body(100 + i) for i in range(20)]
+    text, stats = deduplicate_pages([small, large])
+    assert "Small Report Header" not in text
+    assert stats["lines_stripped"] == 4
+
+
+def test_duplicate_document_dropped_across_uploads():
+    document = [f"Handbook\n{make_body(i)}\nPage {i + 1}" for i in range(4)]
+    text, stats = deduplicate_pages([document, list(document)])
+    assert stats["pages_dropped"] == 4
+    assert stats["bytes_removed"] > 0
+    assert stats["tokens_removed"] > 0
+    assert text.count(make_body(0)) == 1
+
+
+def test_lines_ending_in_numbers_survive():
+    pages = [f"Section {i}\n{make_body(i)}\nTotal items 4{i}" for i in range(8)]
+    pages += [f"Revenue grew in quarter {i}\n{make_body(10 + i)}" for i in range(6)]
+    cleaned, stripped = strip_boilerplate_lines(pages)
+    assert stripped == 0
+    assert cleaned == pages
+
+
+def test_running_footer_with_page_number_stripped():
+    pages = [f"{make_body(i)}\nACME Annual Report {i + 1}" for i in range(6)]
+    cleaned, stripped = strip_boilerplate_lines(pages)
+    assert stripped == 6
+    assert all("ACME" not in page for page in cleaned)
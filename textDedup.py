@@ -0,0 +1,172 @@
+import re
+import zlib
+from collections import Counter, defaultdict
+
+import numpy as np
+
+# MinHash/LSH settings: 16 bands of 8 rows gives an LSH threshold around 0.7,
+# candidates are then confirmed against DUPLICATE_THRESHOLD.
+NUM_PERM = 128
+NUM_BANDS = 16
+SHINGLE_SIZE = 5
+DUPLICATE_THRESHOLD = 0.8
+
+# Header/footer settings
+EDGE_LINES = 3
+MIN_PAGES_FOR_BOILERPLATE = 3
+BOILERPLATE_PAGE_RATIO = 0.5
+
+# Shingle hashes are 32-bit and a < 2^31, so a * s + b stays within uint64
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.default_rng(1)
+_PERM_A = _rng.integers(1, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_PAGE_NUMBER_PATTERNS = [
+    (re.compile(r'\bpage\s+\d+(\s+of\s+\d+)?\b'), 'page #'),
+    (re.compile(r'^[-\s]*\d+(\s*/\s*\d+)?[-\s]*$'), '#'),
+]
+_TRAILING_NUMBER = re.compile(r'^(.*\S) (\d+)$')
+
+
+def count_tokens(text):
+    """Approximate token count using word and punctuation tokens"""
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def _normalize_line(line, page_no):
+    """Normalize a line so page numbers and spacing don't affect matching.
+
+    A trailing number only counts as a page number when it equals page_no, the
+    1-based position of the page in its document; other numbers are kept.
+    """
+    line = re.sub(r'\s+', ' ', line.strip().lower())
+    for pattern, replacement in _PAGE_NUMBER_PATTERNS:
+        line = pattern.sub(replacement, line)
+    match = _TRAILING_NUMBER.match(line)
+    if match and int(match.group(2)) == page_no:
+        line = match.group(1) + ' #'
+    return line
+
+
+def _shingles(text):
+    """Return the array of hashed word shingles for a page"""
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < SHINGLE_SIZE:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    return np.fromiter({zlib.crc32(gram.encode('utf-8')) for gram in grams}, dtype=np.uint64)
+
+
+def minhash_signature(text):
+    """Compute the MinHash signature of a page, or None if it has no words"""
+    shingles = _shingles(text)
+    if not shingles.size:
+        return None
+    hashes = (np.outer(shingles, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return hashes.min(axis=0)
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Estimate Jaccard similarity from two MinHash signatures"""
+    return float(np.mean(sig_a == sig_b))
+
+
+def _edge_indices(lines):
+    """Return indices of the top and bottom non-empty lines of a page"""
+    content = [i for i, line in enumerate(lines) if line.strip()]
+    return content[:EDGE_LINES], content[-EDGE_LINES:]
+
+
+def strip_boilerplate_lines(pages):
+    """Remove header and footer lines repeated across the pages of one document"""
+    if len(pages) < MIN_PAGES_FOR_BOILERPLATE:
+        return pages, 0
+
+    page_lines = [page.splitlines() for page in pages]
+    top_counts = Counter()
+    bottom_counts = Counter()
+    for page_no, lines in enumerate(page_lines, 1):
+        top, bottom = _edge_indices(lines)
+        top_counts.update({_normalize_line(lines[i], page_no) for i in top})
+        bottom_counts.update({_normalize_line(lines[i], page_no) for i in bottom})
+
+    min_count = max(MIN_PAGES_FOR_BOILERPLATE, int(len(pages) * BOILERPLATE_PAGE_RATIO))
+    top_boilerplate = {line for line, count in top_counts.items() if count >= min_count}
+    bottom_boilerplate = {line for line, count in bottom_counts.items() if count >= min_count}
+    if not top_boilerplate and not bottom_boilerplate:
+        return pages, 0
+
+    cleaned_pages = []
+    stripped = 0
+    for page_no, lines in enumerate(page_lines, 1):
+        top, bottom = _edge_indices(lines)
+        remove = {i for i in top if _normalize_line(lines[i], page_no) in top_boilerplate}
+        remove |= {i for i in bottom if _normalize_line(lines[i], page_no) in bottom_boilerplate}
+        stripped += len(remove)
+        cleaned_pages.append("\n".join(line for i, line in enumerate(lines) if i not in remove))
+    return cleaned_pages, stripped
+
+
+def drop_duplicate_pages(pages):
+    """Drop pages that are near-duplicates of an earlier page using MinHash/LSH"""
+    rows = NUM_PERM // NUM_BANDS
+    buckets = defaultdict(list)
+    kept_pages = []
+    kept_signatures = []
+    dropped = 0
+
+    for page in pages:
+        signature = minhash_signature(page)
+        if signature is None:
+            if page.strip():
+                kept_pages.append(page)
+            continue
+
+        band_keys = [
+            (band, signature[band * rows:(band + 1) * rows].tobytes())
+            for band in range(NUM_BANDS)
+        ]
+        candidates = {idx for key in band_keys for idx in buckets.get(key, [])}
+        if any(estimate_similarity(signature, kept_signatures[idx]) >= DUPLICATE_THRESHOLD
+               for idx in candidates):
+            dropped += 1
+            continue
+
+        idx = len(kept_signatures)
+        kept_signatures.append(signature)
+        kept_pages.append(page)
+        for key in band_keys:
+            buckets[key].append(idx)
+
+    return kept_pages, dropped
+
+
+def deduplicate_pages(documents):
+    """Strip repeated headers/footers and near-duplicate pages.
+
+    documents is a list of page lists, one per uploaded PDF. Headers and footers
+    are detected within each document; duplicate pages are dropped across all of
+    them. Returns the cleaned text and a dict of statistics about what was removed.
+    """
+    original_text = "\n".join(page for pages in documents for page in pages).strip()
+
+    cleaned_pages = []
+    lines_stripped = 0
+    for pages in documents:
+        cleaned, stripped = strip_boilerplate_lines(pages)
+        cleaned_pages.extend(cleaned)
+        lines_stripped += stripped
+    kept_pages, pages_dropped = drop_duplicate_pages(cleaned_pages)
+    text = "\n".join(kept_pages).strip()
+
+    stats = {
+        "pages_dropped": pages_dropped,
+        "lines_stripped": lines_stripped,
+        "bytes_removed": len(original_text.encode('utf-8')) - len(text.encode('utf-8')),
+        "tokens_removed": count_tokens(original_text) - count_tokens(text),
+    }
+    return text, stats